@@ -1,12 +1,16 @@
 import pickle
 import time
+from concurrent.futures import ThreadPoolExecutor
 from itertools import combinations
 
 import pandas as pd
 import spacy
 import wikipediaapi
 
-nlp = spacy.load("en_core_web_lg")
+# only NER is used, so skip loading the rest of the pipeline
+nlp = spacy.load(
+    "en_core_web_lg", exclude=["tagger", "parser", "attribute_ruler", "lemmatizer"]
+)
 
 wiki_wiki = wikipediaapi.Wikipedia(
     user_agent="Semiconductor KG (zoltan.varju@crowintelligence.org)",
@@ -14,10 +18,21 @@ wiki_wiki = wikipediaapi.Wikipedia(
     extract_format=wikipediaapi.ExtractFormat.WIKI,
 )
 
+# Wikipedia tolerates a few parallel clients; each still waits between requests
+MAX_CONCURRENT_FETCHES = 4
+
+
+def fetch_page_text(org_name):
+    """Fetch the plain text of an organization's Wikipedia page"""
+    print(f"Fetching {org_name}")
+    text = wiki_wiki.page(org_name).text
+    # being nice to the API :D
+    time.sleep(1)
+    return text
+
 
-def extract_organizations(text):
-    """Extract organization names from text using spaCy NER"""
-    doc = nlp(text)
+def extract_organizations(doc):
+    """Extract organization names from a spaCy Doc using NER"""
     organizations = []
 
     for ent in doc.ents:
@@ -28,28 +43,34 @@ def extract_organizations(text):
     return organizations
 
 
-df = pd.read_csv("data/semiconductor_seed.csv")
+df = pd.read_csv(
+    "data/semiconductor_seed.csv",
+    usecols=["Name"],
+    dtype={"Name": str},
+    keep_default_na=False,
+)
+
+org_names = df["Name"].tolist()
+with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_FETCHES) as executor:
+    pages = dict(zip(org_names, executor.map(fetch_page_text, org_names)))
 
 nodes = set()
-edges = []
+edges = set()
 
-for _, row in df.iterrows():
-    org_name = row["Name"]
+# the script runs at module level, so stay in-process (n_process=1);
+# worker processes would re-import it under the spawn start method
+for org_name, doc in zip(pages.keys(), nlp.pipe(pages.values(), batch_size=32)):
     print(f"Processing {org_name}")
-    page_py = wiki_wiki.page(org_name)
-    org_text = page_py.text
-
-    organizations = set(extract_organizations(org_text))
+    organizations = set(extract_organizations(doc))
     nodes.update(organizations)
-    edges.extend(list(combinations(organizations, 2)))
+    # sorting first gives every undirected edge a canonical (a, b) order
+    edges.update(combinations(sorted(organizations), 2))
 
     print(len(nodes), len(edges))
-    # being nice to the API :D
-    time.sleep(1)
 
 
 nodes = sorted(nodes)
-sorted_edges = sorted([tuple(sorted(t)) for t in edges])
+sorted_edges = sorted(edges)
 
 with open("data/semiconductor_kg.pickle", "wb") as f:
     pickle.dump({"nodes": nodes, "edges": sorted_edges}, f)
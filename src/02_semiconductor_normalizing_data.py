@@ -1,6 +1,8 @@
 import json
 import pickle
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 import requests
@@ -13,6 +15,38 @@ LM_STUDIO_API_URL = "http://localhost:1234/v1/chat/completions"
 
 SINGLE_REQUEST_TIMEOUT = 20
 
+# LM Studio serves chat completions concurrently; keep a few in flight
+MAX_CONCURRENT_REQUESTS = 4
+
+# abbreviations and punctuation the rule-based cleanup can't resolve
+AMBIGUITY_MARKERS = ("(", "semi ", "intl", "mfg", "&")
+
+# applied in order, so e.g. "Foo Holdings Inc" loses both suffixes
+LEGAL_SUFFIX_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in [
+        r"\s+inc\.?$",
+        r"\s+incorporated$",
+        r"\s+corp\.?$",
+        r"\s+corporation$",
+        r"\s+ltd\.?$",
+        r"\s+limited$",
+        r"\s+llc$",
+        r"\s+l\.l\.c\.?$",
+        r"\s+gmbh$",
+        r"\s+co\.?$",
+        r"\s+company$",
+        r"\s+group$",
+        r"\s+holdings?$",
+    ]
+]
+PARENTHESIZED_RE = re.compile(r"\s*\([^)]*\)")
+NON_WORD_RE = re.compile(r"[^\w\s-]")
+WHITESPACE_RE = re.compile(r"\s+")
+
+# one pooled session so worker threads reuse keep-alive connections
+session = requests.Session()
+
 
 @retry(wait=wait_fixed(2), stop=stop_after_attempt(3))
 def normalize_company_name(company_name):
@@ -54,7 +88,7 @@ Output: Taiwan Semiconductor Manufacturing""",
     }
 
     try:
-        response = requests.post(
+        response = session.post(
             LM_STUDIO_API_URL,
             headers=headers,
             data=json.dumps(payload),
@@ -77,44 +111,95 @@ Output: Taiwan Semiconductor Manufacturing""",
         raise
 
 
-def batch_normalize_company_names(company_names, batch_size=3):
+def normalize_concurrently(company_names, max_workers=MAX_CONCURRENT_REQUESTS):
     """
-    Process a list of company names in smaller batches with better error handling
+    Run normalize_company_name over a list of names on a small thread pool
 
     Args:
         company_names (list): List of company names to normalize
-        batch_size (int): Number of names to process in each batch (smaller is more reliable)
+        max_workers (int): Number of requests kept in flight at once
 
     Returns:
-        dict: Mapping from original names to normalized names
+        list: (name, normalized_name, error) tuples in input order;
+            error is None on success, normalized_name is None on failure
     """
-    results = {}
 
-    for i in tqdm(range(0, len(company_names), batch_size)):
-        batch = company_names[i : i + batch_size]
+    def try_normalize(name):
+        try:
+            return name, normalize_company_name(name), None
+        except Exception as e:
+            return name, None, e
 
-        for name in batch:
-            if name in results:
-                continue
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            tqdm(executor.map(try_normalize, company_names), total=len(company_names))
+        )
 
-            try:
-                if i > 0 or batch.index(name) > 0:
-                    time.sleep(1)
 
-                normalized_name = normalize_company_name(name)
-                results[name] = normalized_name
+def needs_llm_normalization(company_name):
+    """
+    Check whether a company name is ambiguous enough to send to the LLM
 
-            except Exception as e:
-                print(f"Error processing '{name}': {e}")
-                results[name] = name
-                time.sleep(3)
+    Names that simple_company_name_cleanup would leave unchanged (apart from
+    casing) and that contain no ambiguity markers are already normalized.
 
-    return results
+    Args:
+        company_name (str): The company name to check
+
+    Returns:
+        bool: True if the name should be normalized by the LLM
+    """
+    padded_name = f"{company_name.lower()} "
+    if any(marker in padded_name for marker in AMBIGUITY_MARKERS):
+        return True
+    return simple_company_name_cleanup(company_name).lower() != company_name.lower()
+
+
+def batch_normalize_company_names(company_names, max_workers=MAX_CONCURRENT_REQUESTS):
+    """
+    Process a list of company names concurrently with per-name error handling;
+    names that are already clean are kept as they are without calling the LLM
+
+    Args:
+        company_names (list): List of company names to normalize
+        max_workers (int): Number of requests kept in flight at once
+
+    Returns:
+        dict: Mapping from original names to normalized names
+    """
+    # case variants of the same name share one answer
+    unique_names = {}
+    for name in company_names:
+        unique_names.setdefault(name.casefold(), name)
+
+    unique_results = {}
+    ambiguous_names = []
+    for name in unique_names.values():
+        if needs_llm_normalization(name):
+            ambiguous_names.append(name)
+        else:
+            unique_results[name] = name
+    print(
+        f"{len(unique_results)} names already clean, {len(ambiguous_names)} sent to LLM"
+    )
+
+    for name, normalized_name, error in normalize_concurrently(
+        ambiguous_names, max_workers
+    ):
+        if error is not None:
+            print(f"Error processing '{name}': {error}")
+            unique_results[name] = name
+        else:
+            unique_results[name] = normalized_name
+
+    return {
+        name: unique_results[unique_names[name.casefold()]] for name in company_names
+    }
 
 
 def normalize_with_smaller_batches_and_fallbacks(company_names):
     """
-    A more robust approach that processes very small batches
+    A more robust approach that retries failures serially
     and has multiple fallback mechanisms
 
     Args:
@@ -127,20 +212,12 @@ def normalize_with_smaller_batches_and_fallbacks(company_names):
     failed_names = []
 
     print("First pass - processing companies...")
-    for i in tqdm(range(0, len(company_names), 1)):
-        name = company_names[i]
-
-        try:
-            if i > 0:
-                time.sleep(1.5)
-
-            normalized_name = normalize_company_name(name)
-            results[name] = normalized_name
-
-        except Exception as e:
-            print(f"First pass: Failed to process '{name}': {e}")
+    for name, normalized_name, error in normalize_concurrently(company_names):
+        if error is not None:
+            print(f"First pass: Failed to process '{name}': {error}")
             failed_names.append(name)
-            time.sleep(2)
+        else:
+            results[name] = normalized_name
 
     if failed_names:
         print(f"\nSecond pass - retrying {len(failed_names)} failed companies...")
@@ -167,30 +244,12 @@ def simple_company_name_cleanup(company_name):
     Returns:
         str: The normalized company name
     """
-    import re
-
     name = company_name.lower()
-    legal_suffixes = [
-        r"\s+inc\.?$",
-        r"\s+incorporated$",
-        r"\s+corp\.?$",
-        r"\s+corporation$",
-        r"\s+ltd\.?$",
-        r"\s+limited$",
-        r"\s+llc$",
-        r"\s+l\.l\.c\.?$",
-        r"\s+gmbh$",
-        r"\s+co\.?$",
-        r"\s+company$",
-        r"\s+group$",
-        r"\s+holdings?$",
-    ]
-
-    for suffix in legal_suffixes:
-        name = re.sub(suffix, "", name, flags=re.IGNORECASE)
-    name = re.sub(r"\s*\([^)]*\)", "", name)
-    name = re.sub(r"[^\w\s-]", " ", name)
-    name = re.sub(r"\s+", " ", name).strip()
+    for suffix in LEGAL_SUFFIX_PATTERNS:
+        name = suffix.sub("", name)
+    name = PARENTHESIZED_RE.sub("", name)
+    name = NON_WORD_RE.sub(" ", name)
+    name = WHITESPACE_RE.sub(" ", name).strip()
 
     return name.title()
 
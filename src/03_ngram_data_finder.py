@@ -1,33 +1,66 @@
 import os
 
+import numpy as np
 import pandas as pd
 
 df_file = "data/ngram_helpers/terms.csv"
+output_file = "data/ngram_helpers/terms_with_files.csv"
+chunk_size = 1_000_000
 input_path = "data/ngram_helpers"
 metafiles = [f for f in os.listdir(input_path) if f.endswith(".txt")]
 
 
-def find_file_for_term(term, files_with_first_terms):
+def read_first_term(path):
     """
-    Given a term and a list of (filename, first_term) tuples sorted by first_term,
-    returns the filename where the term would be found.
+    Returns the first term of an n-gram file, i.e. the first tab-separated
+    field of its first line.
+    """
+    with open(path, encoding="utf-8") as f:
+        return f.readline().split("\t", 1)[0].strip()
+
+
+files_with_first_terms = sorted(
+    ((f, read_first_term(os.path.join(input_path, f))) for f in metafiles),
+    key=lambda pair: pair[1],
+)
+filenames = np.array([filename for filename, _ in files_with_first_terms], dtype=object)
+# object arrays compare as Python strings and aren't padded to the longest term
+first_terms = np.array(
+    [first_term for _, first_term in files_with_first_terms], dtype=object
+)
+
+
+def assign_files(terms):
+    """
+    Given an array of terms, returns the filename where each term would be
+    found, i.e. the last file whose first_term sorts at or before the term.
 
     Parameters:
-    - term: The search term (string).
-    - files_with_first_terms: List of tuples (filename, first_term), sorted by first_term.
+    - terms: Array of search terms (strings).
 
     Returns:
-    - The filename (string) containing the term.
+    - Object array with the filename for each term, or None where the term
+      is missing, sorts before the first file, or there are no files at all.
     """
-    result = None
-    for filename, first_term in files_with_first_terms:
-        if first_term <= term:
-            result = filename
-        else:
-            break
-    return result
-
-
-df = pd.read_csv(os.path.join(input_path, df_file))
-for _, row in df.iterrows():
-    term = row["term"]
+    files = np.full(len(terms), None, dtype=object)
+    if len(filenames) == 0:
+        return files
+
+    present = ~pd.isna(terms)
+    idx = np.searchsorted(first_terms, terms[present], side="right") - 1
+    files[present] = np.where(idx >= 0, filenames[np.maximum(idx, 0)], None)
+    return files
+
+
+# stream terms.csv in chunks so memory stays bounded by chunk_size
+# keep_default_na=False keeps words like "NA" or "null" as literal terms
+chunks = pd.read_csv(
+    df_file,
+    usecols=["term"],
+    dtype={"term": str},
+    keep_default_na=False,
+    chunksize=chunk_size,
+)
+for i, chunk in enumerate(chunks):
+    chunk["file"] = assign_files(chunk["term"].to_numpy(dtype=object))
+    chunk.to_csv(output_file, mode="w" if i == 0 else "a", header=i == 0, index=False)